@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+撲克牌接龍規則 - 牌的編碼與移動規則
+"""
+
+# Suits are plain ints so suit checks are int compares and tuple lookups
+SPADE, HEART, DIAMOND, CLUB = range(4)
+SUIT_GLYPHS = ('♠', '♥', '♦', '♣')
+IS_RED = (False, True, True, False)
+
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+
+# A card is packed into one byte: bits 0-3 rank value (1-13), bits 4-5 suit,
+# bit 6 face up. Piles are bytearrays of these.
+RANK_MASK = 0x0F
+CARD_MASK = 0x3F
+FACE_UP = 0x40
+
+# bytes.translate table that clears the face-up bit of every card
+FACE_DOWN = bytes(byte & ~FACE_UP for byte in range(256))
+
+def make_card(suit, value, face_up=False):
+    return suit << 4 | value | (FACE_UP if face_up else 0)
+
+# Move rules precomputed as lookup tables, indexed by card << 6 | top with the
+# face-up bit masked off, or by card alone for an empty pile
+CAN_STACK = bytes(card & RANK_MASK == (top & RANK_MASK) - 1 and IS_RED[card >> 4] != IS_RED[top >> 4]
+                  for card in range(64) for top in range(64))
+CAN_FOUND = bytes(card >> 4 == top >> 4 and card & RANK_MASK == (top & RANK_MASK) + 1
+                  for card in range(64) for top in range(64))
+EMPTY_STACK = bytes(card & RANK_MASK == 13 for card in range(64))
+EMPTY_FOUND = bytes(card & RANK_MASK == 1 for card in range(64))
+
+# The same rules inverted: the cards a given top card (or an empty pile) accepts
+STACK_ACCEPTS = tuple(tuple(card for card in range(64) if CAN_STACK[card << 6 | top])
+                      for top in range(64))
+FOUND_ACCEPTS = tuple(tuple(card for card in range(64) if CAN_FOUND[card << 6 | top])
+                      for top in range(64))
+EMPTY_STACK_ACCEPTS = tuple(card for card in range(64) if EMPTY_STACK[card])
+EMPTY_FOUND_ACCEPTS = tuple(card for card in range(64) if EMPTY_FOUND[card])
+
+# Display label per card, indexed by the card with the face-up bit masked off
+CARD_LABELS = tuple(f"{RANKS[(card & RANK_MASK) - 1]}{SUIT_GLYPHS[card >> 4]}"
+                    if 1 <= card & RANK_MASK <= len(RANKS) else ''
+                    for card in range(64))
+
+# Every card face down, shuffled into a fresh bytearray for each deal
+DECK52 = bytes(make_card(suit, value) for suit in range(len(SUIT_GLYPHS))
+               for value in range(1, len(RANKS) + 1))
+
+def can_place_on_tableau(card, pile):
+    if not pile:
+        return EMPTY_STACK[card & CARD_MASK]
+    return CAN_STACK[(card & CARD_MASK) << 6 | pile[-1] & CARD_MASK]
+
+def can_move_to_foundation(card, foundation):
+    if not foundation:
+        return EMPTY_FOUND[card & CARD_MASK]
+    return CAN_FOUND[(card & CARD_MASK) << 6 | foundation[-1] & CARD_MASK]
+
+def legal_moves(waste, foundations, tableau):
+    # Yields (source, card_idx, (target_kind, target_idx)) for every legal move,
+    # where source is 'waste' or a tableau index as in SolitaireGame.
+    # Index the cards each pile accepts first, so every candidate is a dict probe.
+    found_need = {}
+    for i, foundation in enumerate(foundations):
+        for card in FOUND_ACCEPTS[foundation[-1] & CARD_MASK] if foundation else EMPTY_FOUND_ACCEPTS:
+            found_need.setdefault(card, []).append(i)
+    stack_need = {}
+    for i, pile in enumerate(tableau):
+        for card in STACK_ACCEPTS[pile[-1] & CARD_MASK] if pile else EMPTY_STACK_ACCEPTS:
+            stack_need.setdefault(card, []).append(i)
+    
+    if waste:
+        card = waste[-1] & CARD_MASK
+        for i in found_need.get(card, ()):
+            yield ('waste', len(waste) - 1, ('foundation', i))
+        for i in stack_need.get(card, ()):
+            yield ('waste', len(waste) - 1, ('tableau', i))
+    
+    for src, src_pile in enumerate(tableau):
+        if not src_pile or not src_pile[-1] & FACE_UP:
+            continue
+        for i in found_need.get(src_pile[-1] & CARD_MASK, ()):
+            yield (src, len(src_pile) - 1, ('foundation', i))
+        # Any face-up card can be moved together with the run on top of it
+        for card_idx in range(len(src_pile) - 1, -1, -1):
+            card = src_pile[card_idx]
+            if not card & FACE_UP:
+                break
+            for dst in stack_need.get(card & CARD_MASK, ()):
+                if dst != src:
+                    yield (src, card_idx, ('tableau', dst))
@@ -2,147 +2,154 @@
 # -*- coding: utf-8 -*-
 """
 撲克牌接龍遊戲 (Klondike Solitaire) - Tkinter 版本
+
+需要 Pillow 10.1 以上版本 (牌面以 PIL 預先繪製)
 """
 
 import tkinter as tk
 from tkinter import messagebox
+import bisect
 import random
-from enum import Enum
 
-class Suit(Enum):
-    SPADE = '♠'
-    HEART = '♥'
-    DIAMOND = '♦'
-    CLUB = '♣'
+from PIL import Image, ImageDraw, ImageFont, ImageTk
 
-RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
-RANK_VALUES = {rank: i+1 for i, rank in enumerate(RANKS)}
+from rules import (IS_RED, CARD_MASK, FACE_UP, FACE_DOWN, DECK52, CARD_LABELS,
+                   can_place_on_tableau, can_move_to_foundation, legal_moves)
 
-class Card:
-    def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
-        self.face_up = False
-    
-    def __str__(self):
-        return f"{self.rank}{self.suit.value}"
-    
-    def color(self):
-        return 'red' if self.suit in [Suit.HEART, Suit.DIAMOND] else 'black'
+# Rendered card faces keyed by card code; PIL images are not tied to a Tk
+# interpreter, so every window and every game shares them
+_CARD_PIL_CACHE = {}
 
 class SolitaireGame:
+    __slots__ = ('stock', 'waste', 'foundations', 'tableau', 'selected', 'moves',
+                 '_foundation_total', '_legal_cache')
+    
     def __init__(self):
-        self.stock = []
-        self.waste = []
-        self.foundations = [[], [], [], []]
-        self.tableau = [[], [], [], [], [], [], []]
+        self.stock = bytearray()
+        self.waste = bytearray()
+        self.foundations = [bytearray() for _ in range(4)]
+        self.tableau = [bytearray() for _ in range(7)]
         self.selected = None
         self.moves = 0
+        self._foundation_total = 0
+        self._legal_cache = None
         self.initialize_deck()
     
     def initialize_deck(self):
-        deck = []
-        for suit in Suit:
-            for rank in RANKS:
-                deck.append(Card(suit, rank))
-        random.shuffle(deck)
+        deck = bytearray(random.sample(DECK52, len(DECK52)))
         
-        # Deal tableau
+        # Deal tableau: pile i takes the next i+1 cards, the last one face up
+        start = 0
         for i in range(7):
-            for j in range(i+1):
-                card = deck.pop()
-                if j == i:
-                    card.face_up = True
-                self.tableau[i].append(card)
+            self.tableau[i][:] = deck[start:start + i + 1]
+            self.tableau[i][-1] |= FACE_UP
+            start += i + 1
         
         # Remaining cards to stock
-        self.stock = deck
+        self.stock[:] = deck[start:]
     
     def new_game(self):
-        self.__init__()
+        # Reset in place; the tableau and stock are refilled by initialize_deck
+        self.waste.clear()
+        for foundation in self.foundations:
+            foundation.clear()
+        self.selected = None
+        self.moves = 0
+        self._foundation_total = 0
+        self._legal_cache = None
+        self.initialize_deck()
+    
+    def legal_moves(self):
+        # Computed once per position; every state change drops the cache
+        if self._legal_cache is None:
+            self._legal_cache = list(legal_moves(self.waste, self.foundations, self.tableau))
+        return self._legal_cache
     
     def draw_from_stock(self):
+        self._legal_cache = None
         if not self.stock:
-            # Recycle waste
-            while self.waste:
-                card = self.waste.pop()
-                card.face_up = False
-                self.stock.append(card)
+            # Recycle waste: reverse it and turn it face down in one pass
+            self.stock[:] = self.waste[::-1].translate(FACE_DOWN)
+            self.waste.clear()
             return
         
-        card = self.stock.pop()
-        card.face_up = True
-        self.waste.append(card)
+        self.waste.append(self.stock.pop() | FACE_UP)
         self.moves += 1
     
-    def can_place_on_tableau(self, card, pile):
-        if not pile:
-            return card.rank == 'K'
-        top = pile[-1]
-        return (RANK_VALUES[card.rank] == RANK_VALUES[top.rank] - 1 and 
-                card.color() != top.color())
-    
-    def can_move_to_foundation(self, card, foundation_idx):
-        foundation = self.foundations[foundation_idx]
-        if not foundation:
-            return card.rank == 'A'
-        top = foundation[-1]
-        return (card.suit == top.suit and 
-                RANK_VALUES[card.rank] == RANK_VALUES[top.rank] + 1)
-    
     def move_to_tableau(self, from_pile, to_pile_idx, card_idx):
         if from_pile == 'waste':
             if not self.waste:
                 return False
             card = self.waste[-1]
-            if self.can_place_on_tableau(card, self.tableau[to_pile_idx]):
+            if can_place_on_tableau(card, self.tableau[to_pile_idx]):
                 self.tableau[to_pile_idx].append(self.waste.pop())
                 self.moves += 1
+                self._legal_cache = None
                 # Flip top card of waste if available
-                if self.waste and not self.waste[-1].face_up:
-                    self.waste[-1].face_up = True
+                if self.waste and not self.waste[-1] & FACE_UP:
+                    self.waste[-1] |= FACE_UP
                 return True
         elif from_pile in range(7):
             pile = self.tableau[from_pile]
-            if card_idx < len(pile) and pile[card_idx].face_up:
+            if card_idx < len(pile) and pile[card_idx] & FACE_UP:
                 cards_to_move = pile[card_idx:]
-                if self.can_place_on_tableau(cards_to_move[0], self.tableau[to_pile_idx]):
+                if can_place_on_tableau(cards_to_move[0], self.tableau[to_pile_idx]):
                     self.tableau[to_pile_idx].extend(cards_to_move)
                     del pile[card_idx:]
                     self.moves += 1
+                    self._legal_cache = None
                     # Flip top card
-                    if pile and not pile[-1].face_up:
-                        pile[-1].face_up = True
+                    if pile and not pile[-1] & FACE_UP:
+                        pile[-1] |= FACE_UP
                     return True
         return False
     
-    def move_to_foundation(self, from_pile, foundation_idx):
+    def move_to_foundation(self, from_pile, foundation_idx, card_idx):
         card = None
         if from_pile == 'waste':
-            if self.waste and self.can_move_to_foundation(self.waste[-1], foundation_idx):
+            if self.waste and can_move_to_foundation(self.waste[-1], self.foundations[foundation_idx]):
                 card = self.waste.pop()
         elif from_pile in range(7):
             pile = self.tableau[from_pile]
-            if pile and pile[-1].face_up and self.can_move_to_foundation(pile[-1], foundation_idx):
+            # Only the top card of a column can go to a foundation
+            if (card_idx == len(pile) - 1 and pile[-1] & FACE_UP
+                    and can_move_to_foundation(pile[-1], self.foundations[foundation_idx])):
                 card = pile.pop()
         
-        if card:
+        if card is not None:
             self.foundations[foundation_idx].append(card)
+            self._foundation_total += 1
             self.moves += 1
+            self._legal_cache = None
             # Flip top card if in tableau
-            if from_pile in range(7) and self.tableau[from_pile] and not self.tableau[from_pile][-1].face_up:
-                self.tableau[from_pile][-1].face_up = True
+            if from_pile in range(7) and self.tableau[from_pile] and not self.tableau[from_pile][-1] & FACE_UP:
+                self.tableau[from_pile][-1] |= FACE_UP
+            return True
+        return False
+    
+    def flip_tableau_card(self, pile_idx):
+        pile = self.tableau[pile_idx]
+        if pile and not pile[-1] & FACE_UP:
+            pile[-1] |= FACE_UP
+            self._legal_cache = None
             return True
         return False
     
     def is_won(self):
-        return all(len(f) == 13 for f in self.foundations)
+        return self._foundation_total == len(DECK52)
 
 class SolitaireGUI:
     CARD_WIDTH = 80
     CARD_HEIGHT = 120
     CARD_GAP = 30
     
+    __slots__ = ('root', 'game', 'selected_card_idx', 'selected_source',
+                 'status_label', 'canvas', 'pile_origins', '_last_status', '_redraw_pending',
+                 '_pile_items', '_free_items', '_item_state', '_dirty', '_shown_targets',
+                 '_selection_item', '_shown_selection', '_target_items', '_row_y', '_col_x', '_grid',
+                 '_card_imgs', '_back_img', '_back_stack_imgs', '_stock_img', '_empty_img',
+                 '_text_font')
+    
     def __init__(self, root):
         self.root = root
         self.root.title("撲克牌接龍 - Tkinter 版")
@@ -150,9 +157,12 @@ class SolitaireGUI:
         self.root.configure(bg='#0b6623')
         
         self.game = SolitaireGame()
-        self.selected_card = None
+        self.selected_card_idx = None
         self.selected_source = None
+        self._last_status = None
+        self._redraw_pending = False
         
+        self.build_card_images()
         self.setup_ui()
         self.draw_game()
     
@@ -185,102 +195,259 @@ class SolitaireGUI:
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         
         # Pile information (for coordinate mapping)
-        self.pile_coords = {}
-    
-    def draw_game(self):
-        self.canvas.delete("all")
-        self.pile_coords.clear()
+        self.pile_origins = {"stock": (20, 20), "waste": (20 + self.CARD_WIDTH + 20, 20)}
+        for i in range(4):
+            self.pile_origins[f"foundation_{i}"] = (400 + i * (self.CARD_WIDTH + 10), 20)
+        for i in range(7):
+            self.pile_origins[f"tableau_{i}"] = (20 + i * (self.CARD_WIDTH + 10), 160)
         
-        # Top row: Stock, Waste, Foundations
-        y = 20
-        x = 20
+        # Empty-slot placeholders are permanent; cards are always stacked above them
+        for x, y in self.pile_origins.values():
+            self.canvas.create_image(x, y, anchor='nw', image=self._empty_img)
         
-        # Stock pile
-        self.draw_pile(x, y, self.game.stock, "stock", len(self.game.stock) > 0)
-        self.pile_coords["stock"] = (x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT)
+        # Canvas item ids per pile, and the piles whose items are out of date
+        self._pile_items = {pile_name: [] for pile_name in self.pile_origins}
+        self._free_items = [self.canvas.create_image(0, 0, anchor='nw', state='hidden')
+                            for _ in range(60)]
+        # Position and image each visible item currently shows
+        self._item_state = {}
+        self._dirty = set(self.pile_origins)
+        self._shown_targets = set()
+        self._selection_item = self.canvas.create_rectangle(0, 0, 0, 0, outline='#00bfff', width=3,
+                                                            state='hidden')
+        self._shown_selection = (None, None)
+        # One long-lived target outline per pile that can receive cards
+        self._target_items = {pile_name: self.canvas.create_rectangle(0, 0, 0, 0, outline='#ffd700',
+                                                                      width=3, state='hidden')
+                              for pile_name in self.pile_origins
+                              if pile_name.startswith(("foundation_", "tableau_"))}
         
-        # Waste pile
-        x += self.CARD_WIDTH + 20
-        if self.game.waste:
-            card = self.game.waste[-1]
-            self.draw_card_graphic(x, y, card, True, "waste")
-        else:
-            self.draw_empty_pile(x, y)
-        self.pile_coords["waste"] = (x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT)
+        # Piles form two rows of fixed columns: map (row, col) straight to a pile
+        self._row_y = sorted({y for x, y in self.pile_origins.values()})
+        self._col_x = [sorted(x for x, y in self.pile_origins.values() if y == row_y)
+                       for row_y in self._row_y]
+        self._grid = {}
+        for pile_name, (x, y) in self.pile_origins.items():
+            row = self._row_y.index(y)
+            self._grid[(row, self._col_x[row].index(x))] = pile_name
+    
+    def schedule_redraw(self):
+        # Coalesce all redraw requests until Tk is idle into one draw_game
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._do_redraw)
+    
+    def _do_redraw(self):
+        self._redraw_pending = False
+        self.draw_game()
+    
+    def draw_game(self):
+        # Only piles touched since the last redraw are refreshed
+        for pile_name in self._dirty:
+            self.draw_pile(pile_name)
         
-        # Foundations
-        x = 400
-        for i in range(4):
-            if self.game.foundations[i]:
-                card = self.game.foundations[i][-1]
-                self.draw_card_graphic(x, y, card, True, f"foundation_{i}")
-            else:
-                self.draw_empty_pile(x, y)
-            self.pile_coords[f"foundation_{i}"] = (x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT)
-            x += self.CARD_WIDTH + 10
+        if self.selected_source is None:
+            source_pile = None
+        elif self.selected_source == "waste":
+            source_pile = "waste"
+        else:
+            source_pile = f"tableau_{self.selected_source}"
+        selection = (source_pile, self.selected_card_idx)
+        if selection != self._shown_selection or source_pile in self._dirty:
+            self.draw_selection(source_pile)
         
-        # Tableau
-        y = 160
-        x = 20
-        for pile_idx in range(7):
-            pile = self.game.tableau[pile_idx]
-            if not pile:
-                self.draw_empty_pile(x, y)
-                self.pile_coords[f"tableau_{pile_idx}"] = (x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT)
-            else:
-                for card_idx, card in enumerate(pile):
-                    card_y = y + card_idx * self.CARD_GAP
-                    if card.face_up:
-                        self.draw_card_graphic(x, card_y, card, True, f"tableau_{pile_idx}_{card_idx}")
-                    else:
-                        self.draw_card_back(x, card_y)
-                self.pile_coords[f"tableau_{pile_idx}"] = (x, y, x + self.CARD_WIDTH, y + len(pile) * self.CARD_GAP + self.CARD_HEIGHT)
-            x += self.CARD_WIDTH + 10
+        targets = self.selection_targets()
+        if targets != self._shown_targets or not self._dirty.isdisjoint(targets):
+            self.draw_targets(targets)
+        self._dirty.clear()
         
         self.update_status()
     
-    def draw_empty_pile(self, x, y):
-        self.canvas.create_rectangle(x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT,
-                                     fill='#1a7a2a', outline='white', width=2, dash=(4, 4))
+    def selection_targets(self):
+        # Piles the selected card could legally move to
+        if self.selected_source is None:
+            return set()
+        return {f"{kind}_{idx}" for source, card_idx, (kind, idx) in self.game.legal_moves()
+                if source == self.selected_source
+                and (source == "waste" or card_idx == self.selected_card_idx)}
+    
+    def draw_selection(self, source_pile):
+        # One long-lived outline item, moved to the selected card or hidden
+        self._shown_selection = (source_pile, self.selected_card_idx)
+        if source_pile is None:
+            self.canvas.itemconfig(self._selection_item, state='hidden')
+            return
+        x, y = self.pile_origins[source_pile]
+        bottom = y + self.CARD_HEIGHT
+        if source_pile != "waste":
+            pile = self.game.tableau[self.selected_source]
+            y += self.selected_card_idx * self.CARD_GAP
+            bottom += (len(pile) - 1) * self.CARD_GAP
+        self.canvas.coords(self._selection_item, x - 2, y - 2, x + self.CARD_WIDTH + 2, bottom + 2)
+        self.canvas.itemconfig(self._selection_item, state='normal')
+        self.canvas.tag_raise(self._selection_item)
+    
+    def draw_targets(self, targets):
+        # Hide outlines that are no longer targets, then move and raise the current ones
+        for pile_name in self._shown_targets - targets:
+            self.canvas.itemconfig(self._target_items[pile_name], state='hidden')
+        for pile_name in targets:
+            x, y = self.pile_origins[pile_name]
+            bottom = y + self.CARD_HEIGHT
+            if pile_name.startswith("tableau_"):
+                pile = self.game.tableau[int(pile_name[8:])]
+                bottom += max(len(pile) - 1, 0) * self.CARD_GAP
+            item = self._target_items[pile_name]
+            self.canvas.coords(item, x - 2, y - 2, x + self.CARD_WIDTH + 2, bottom + 2)
+            self.canvas.itemconfig(item, state='normal')
+            self.canvas.tag_raise(item)
+        self._shown_targets = targets
     
-    def draw_pile(self, x, y, pile, pile_type, has_cards):
-        if has_cards:
-            self.canvas.create_rectangle(x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT,
-                                        fill='#0d5c1f', outline='white', width=2)
-            self.canvas.create_text(x + self.CARD_WIDTH // 2, y + self.CARD_HEIGHT // 2,
-                                   text="🂠", font=("Arial", 40), fill='white')
+    def pile_images(self, pile_name):
+        # (card row, image) pairs shown for a pile, bottom-most first
+        if pile_name == "stock":
+            return [(0, self._stock_img)] if self.game.stock else []
+        if pile_name == "waste":
+            cards = self.game.waste[-1:]
+        elif pile_name.startswith("foundation_"):
+            cards = self.game.foundations[int(pile_name[11:])][-1:]
         else:
-            self.draw_empty_pile(x, y)
-    
-    def draw_card_back(self, x, y):
-        self.canvas.create_rectangle(x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT,
-                                     fill='#1a1a3e', outline='#444444', width=1)
-        self.canvas.create_text(x + self.CARD_WIDTH // 2, y + self.CARD_HEIGHT // 2,
-                               text="🂠", font=("Arial", 20), fill='#aaaaaa')
-    
-    def draw_card_graphic(self, x, y, card, face_up, card_id):
-        color = card.color()
-        fill_color = 'white'
-        text_color = 'red' if color == 'red' else 'black'
+            cards = self.game.tableau[int(pile_name[8:])]
+            # Face-down cards only ever form the bottom run of a column,
+            # and that whole run is one pre-tiled image
+            down = 0
+            while down < len(cards) and not cards[down] & FACE_UP:
+                down += 1
+            if down:
+                return [(0, self._back_stack_imgs[down])] + [
+                    (row, self.card_image(cards[row])) for row in range(down, len(cards))]
+        # An empty pile shows its placeholder and needs no items of its own
+        return [(row, self.card_image(card)) for row, card in enumerate(cards)]
+    
+    def draw_pile(self, pile_name):
+        x, y = self.pile_origins[pile_name]
+        step = self.CARD_GAP if pile_name.startswith("tableau_") else 0
+        images = self.pile_images(pile_name)
+        items = self._pile_items[pile_name]
+        
+        # Growing piles take items from the hidden pool, shrinking ones hand them back
+        for i, (row, image) in enumerate(images):
+            if i == len(items):
+                item = self._free_items.pop() if self._free_items else self.canvas.create_image(0, 0, anchor='nw')
+                self.canvas.tag_raise(item)
+                items.append(item)
+            # Only touch items whose position or image actually changed
+            pos = (x, y + row * step)
+            shown_pos, shown_image = self._item_state.get(items[i], (None, None))
+            if pos != shown_pos:
+                self.canvas.coords(items[i], *pos)
+            if image is not shown_image:
+                self.canvas.itemconfig(items[i], image=image, state='normal')
+            self._item_state[items[i]] = (pos, image)
+        while len(items) > len(images):
+            item = items.pop()
+            self.canvas.itemconfig(item, state='hidden')
+            del self._item_state[item]
+            self._free_items.append(item)
+    
+    @staticmethod
+    def load_font(names, size):
+        for name in names:
+            try:
+                return ImageFont.truetype(name, size)
+            except OSError:
+                continue
+        return ImageFont.load_default(size)
+    
+    def build_card_images(self):
+        # Render the back, the stock and the empty slot once; card faces are
+        # rendered the first time they are shown. The canvas then only needs
+        # a single image item per card.
+        size = (self.CARD_WIDTH, self.CARD_HEIGHT)
+        box = (0, 0, self.CARD_WIDTH - 1, self.CARD_HEIGHT - 1)
+        center = (self.CARD_WIDTH // 2, self.CARD_HEIGHT // 2)
+        self._text_font = self.load_font(("arialbd.ttf", "Arial Bold.ttf", "Arial Unicode.ttf",
+                                          "DejaVuSans-Bold.ttf"), 13)
+        # Pillow's built-in fallback font draws 🂠 and the suit glyphs as empty boxes
+        symbols = ("seguisym.ttf", "Apple Symbols.ttf", "Arial Unicode.ttf", "DejaVuSans.ttf")
+        
+        img = Image.new('RGB', size, '#1a1a3e')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle(box, fill='#1a1a3e', outline='#444444', width=1)
+        draw.text(center, "🂠", font=self.load_font(symbols, 27), fill='#aaaaaa', anchor='mm')
+        self._back_img = ImageTk.PhotoImage(img)
+        
+        # A column's face-down run drawn as one image, indexed by its length;
+        # the deal leaves at most one fewer face-down card than there are columns
+        self._back_stack_imgs = [None]
+        for count in range(1, len(self.game.tableau)):
+            stack = Image.new('RGB', (self.CARD_WIDTH, self.CARD_HEIGHT + (count - 1) * self.CARD_GAP))
+            for row in range(count):
+                stack.paste(img, (0, row * self.CARD_GAP))
+            self._back_stack_imgs.append(ImageTk.PhotoImage(stack))
+        
+        img = Image.new('RGB', size, '#0d5c1f')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle(box, fill='#0d5c1f', outline='white', width=2)
+        draw.text(center, "🂠", font=self.load_font(symbols, 53), fill='white', anchor='mm')
+        self._stock_img = ImageTk.PhotoImage(img)
         
-        self.canvas.create_rectangle(x, y, x + self.CARD_WIDTH, y + self.CARD_HEIGHT,
-                                     fill=fill_color, outline='#cccccc', width=1, tags=card_id)
+        img = Image.new('RGB', size, '#0b6623')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle(box, fill='#1a7a2a')
+        # PIL has no dashed outline, so lay the (4, 4) dash pattern by hand
+        x2, y2 = box[2], box[3]
+        for x in range(0, x2 + 1, 8):
+            draw.line((x, 0, min(x + 3, x2), 0), fill='white', width=2)
+            draw.line((x, y2, min(x + 3, x2), y2), fill='white', width=2)
+        for y in range(0, y2 + 1, 8):
+            draw.line((0, y, 0, min(y + 3, y2)), fill='white', width=2)
+            draw.line((x2, y, x2, min(y + 3, y2)), fill='white', width=2)
+        self._empty_img = ImageTk.PhotoImage(img)
         
-        self.canvas.create_text(x + 8, y + 8, anchor='nw',
-                               text=f"{card.rank}{card.suit.value}",
-                               font=("Arial", 10, "bold"), fill=text_color, tags=card_id)
+        # Indexed by the packed card byte: face-down codes map to the back,
+        # face-up codes are filled in by card_image()
+        self._card_imgs = [self._back_img] * FACE_UP + [None] * FACE_UP
+    
+    def card_image(self, card):
+        image = self._card_imgs[card]
+        if image is None:
+            image = self._card_imgs[card] = ImageTk.PhotoImage(self.render_card_face(card & CARD_MASK))
+        return image
+    
+    def render_card_face(self, card):
+        # The PIL rendering is kept at module level, so it outlives this window
+        img = _CARD_PIL_CACHE.get(card)
+        if img is None:
+            img = Image.new('RGB', (self.CARD_WIDTH, self.CARD_HEIGHT), 'white')
+            draw = ImageDraw.Draw(img)
+            draw.rectangle((0, 0, self.CARD_WIDTH - 1, self.CARD_HEIGHT - 1),
+                           fill='white', outline='#cccccc', width=1)
+            draw.text((8, 8), CARD_LABELS[card], font=self._text_font,
+                      fill='red' if IS_RED[card >> 4] else 'black')
+            _CARD_PIL_CACHE[card] = img
+        return img
     
     def on_canvas_click(self, event):
         x, y = event.x, event.y
-        clicked_pile = None
+        selection = (self.selected_source, self.selected_card_idx)
         
         # Check which pile was clicked
-        for pile_name, (x1, y1, x2, y2) in self.pile_coords.items():
-            if x1 <= x <= x2 and y1 <= y <= y2:
-                clicked_pile = pile_name
-                break
+        row = bisect.bisect_right(self._row_y, y) - 1
+        if row < 0:
+            return
+        col = bisect.bisect_right(self._col_x[row], x) - 1
+        if col < 0 or x > self._col_x[row][col] + self.CARD_WIDTH:
+            return
+        clicked_pile = self._grid[(row, col)]
         
-        if not clicked_pile:
+        # Tableau piles grow downwards; everything else is a single card high
+        pile_y = self._row_y[row]
+        card_idx = 0
+        if clicked_pile.startswith("tableau_"):
+            pile = self.game.tableau[int(clicked_pile[8:])]
+            card_idx = max(min((y - pile_y) // self.CARD_GAP, len(pile) - 1), 0)
+        if y > pile_y + card_idx * self.CARD_GAP + self.CARD_HEIGHT:
             return
         
         # Handle different pile types
@@ -290,78 +457,84 @@ class SolitaireGUI:
             self.select_card("waste", 0)
         elif clicked_pile.startswith("foundation_"):
             foundation_idx = int(clicked_pile.split("_")[1])
-            if self.selected_source:
+            if self.selected_source is not None:
                 self.move_to_foundation(foundation_idx)
-            self.draw_game()
         elif clicked_pile.startswith("tableau_"):
             parts = clicked_pile.split("_")
             tableau_idx = int(parts[1])
-            self.select_tableau_card(tableau_idx)
+            self.select_tableau_card(tableau_idx, card_idx)
         
-        self.draw_game()
+        # Clicks that neither changed a pile nor the selection leave the canvas alone
+        if self._dirty or (self.selected_source, self.selected_card_idx) != selection:
+            self.schedule_redraw()
     
     def select_card(self, source, card_idx):
         if source == "waste" and self.game.waste:
-            self.selected_card = self.game.waste[-1]
+            self.selected_card_idx = len(self.game.waste) - 1
             self.selected_source = "waste"
         elif source in range(7):
             pile = self.game.tableau[source]
-            if card_idx < len(pile) and pile[card_idx].face_up:
-                self.selected_card = pile[card_idx]
+            if card_idx < len(pile) and pile[card_idx] & FACE_UP:
+                self.selected_card_idx = card_idx
                 self.selected_source = source
     
-    def select_tableau_card(self, tableau_idx):
-        pile = self.game.tableau[tableau_idx]
-        if not pile:
-            return
-        
+    def select_tableau_card(self, tableau_idx, card_idx):
         # Click on face-down card to flip
-        if not pile[-1].face_up:
-            pile[-1].face_up = True
+        if self.game.flip_tableau_card(tableau_idx):
+            self._dirty.add(f"tableau_{tableau_idx}")
             return
         
-        # Select the top face-up card
+        # Select the clicked face-up card
         if self.selected_source is not None:
             # Move to this tableau
             if self.selected_source == "waste":
                 if self.game.move_to_tableau("waste", tableau_idx, None):
-                    self.selected_source = None
-                    self.selected_card = None
+                    self._dirty.update(("waste", f"tableau_{tableau_idx}"))
+                    self.clear_selection()
             elif isinstance(self.selected_source, int):
-                # Find the card index in source tableau
-                src_pile = self.game.tableau[self.selected_source]
-                card_idx = src_pile.index(self.selected_card) if self.selected_card in src_pile else -1
-                if card_idx >= 0:
-                    if self.game.move_to_tableau(self.selected_source, tableau_idx, card_idx):
-                        self.selected_source = None
-                        self.selected_card = None
+                # The card index was recorded at selection time
+                if self.game.move_to_tableau(self.selected_source, tableau_idx, self.selected_card_idx):
+                    self._dirty.update((f"tableau_{self.selected_source}", f"tableau_{tableau_idx}"))
+                    self.clear_selection()
         else:
-            # Just select this card
-            self.selected_card = pile[-1]
-            self.selected_source = tableau_idx
+            # Just select this card (and the run on top of it)
+            self.select_card(tableau_idx, card_idx)
+    
+    def clear_selection(self):
+        self.selected_card_idx = None
+        self.selected_source = None
     
     def move_to_foundation(self, foundation_idx):
-        if not self.selected_source:
+        if self.selected_source is None:
             return
         
-        if self.game.move_to_foundation(self.selected_source, foundation_idx):
-            self.selected_source = None
-            self.selected_card = None
+        if self.game.move_to_foundation(self.selected_source, foundation_idx, self.selected_card_idx):
+            source = self.selected_source
+            self._dirty.update(("waste" if source == "waste" else f"tableau_{source}",
+                                f"foundation_{foundation_idx}"))
+            self.clear_selection()
             
             if self.game.is_won():
                 messagebox.showinfo("恭喜！", f"你贏了！\n步數: {self.game.moves}")
     
     def draw_card(self):
         self.game.draw_from_stock()
+        self._dirty.update(("stock", "waste"))
+        self.schedule_redraw()
     
     def new_game(self):
         self.game.new_game()
-        self.selected_card = None
-        self.selected_source = None
-        self.draw_game()
+        self.clear_selection()
+        self._dirty.update(self.pile_origins)
+        self.schedule_redraw()
     
     def update_status(self):
-        status = f"牌庫: {len(self.game.stock)}  棄牌: {len(self.game.waste)}  步數: {self.game.moves}"
+        # Skip the label update when nothing it shows has changed
+        counts = (len(self.game.stock), len(self.game.waste), self.game.moves)
+        if counts == self._last_status:
+            return
+        self._last_status = counts
+        status = f"牌庫: {counts[0]}  棄牌: {counts[1]}  步數: {counts[2]}"
         self.status_label.config(text=status)
 
 def main():